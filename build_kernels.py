@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Pre-populate the numba on-disk kernel cache at install/build time.
+
+All hot kernels in thermal_print are decorated with njit(cache=True),
+so compiling them once writes machine code next to the module in
+__pycache__; every later process start then loads the cached binaries
+in milliseconds instead of JIT-compiling for one to two seconds on the
+first dither. Run this from a package post-install hook or just once
+after cloning:
+
+    python build_kernels.py
+
+(numba's old pycc AOT compiler would produce a shippable extension
+instead, but it was removed from numba; the persistent cache is the
+supported replacement and gives the same cold-start win on the machine
+that ran it.)
+"""
+
+import time
+
+import thermal_print
+
+
+def main():
+    if not thermal_print._HAVE_NUMBA:
+        print("numba is not installed; nothing to compile.")
+        return
+    start = time.time()
+    thermal_print.warm_dither_kernels()
+    print(f"Dither kernels compiled and cached in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
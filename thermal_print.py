@@ -1,28 +1,249 @@
 import subprocess
+import re
+import tempfile
+import functools
+import shutil
+import hashlib
 import os
 import sys
 import argparse
-from PIL import Image, ImageEnhance, ImageDraw, ImageFont
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import PIL
+from PIL import Image, ImageDraw, ImageFont
 import hitherdither
 import numpy as np
 
+# Numba is optional: with it the diffusion kernels JIT to native code, and
+# without it a slower int16 fallback keeps every algorithm available.
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
 
-def ascii_dither(img, target_w, target_h):
+# Prefer a SIMD-accelerated resize backend. Pillow-SIMD advertises itself
+# with a '.postN' version suffix; failing that, fall back to pyvips, whose
+# resize engine processes scanlines in cache-sized tiles. Stock Pillow is
+# the final fallback.
+_PIL_SIMD = 'post' in getattr(PIL, '__version__', '')
+if _PIL_SIMD:
+    _HAVE_VIPS = False
+else:
+    try:
+        import pyvips
+        _HAVE_VIPS = True
+    except ImportError:
+        _HAVE_VIPS = False
+
+
+def _resize_l(arr, new_w, new_h):
     """
-    Convert grayscale image to ASCII art dithering.
-    Uses characters with different densities to represent brightness levels.
-    Font size optimized for 300 DPI printing.
+    Resize a 2-D uint8 grayscale array, using libvips when Pillow isn't
+    SIMD-built. Returns a uint8 array (possibly off-by-one in size when
+    libvips rounds the scale factor). Stock Pillow's C LANCZOS is the
+    final fallback.
+    """
+    h, w = arr.shape
+    if _HAVE_VIPS:
+        vimg = pyvips.Image.new_from_memory(
+            np.ascontiguousarray(arr).tobytes(), w, h, 1, 'uchar')
+        vimg = vimg.resize(new_w / w, vscale=new_h / h, kernel='lanczos3')
+        return np.frombuffer(vimg.write_to_memory(),
+                             dtype=np.uint8).reshape(vimg.height, vimg.width)
+    return np.asarray(Image.fromarray(arr, 'L').resize(
+        (new_w, new_h), Image.Resampling.LANCZOS))
+
+
+# Error-diffusion stencils as lists of (dy, dx, weight) with the divisor
+# already folded into the weight. Tables follow the classic FreeImage /
+# hitherdither coefficient sets.
+_DIFFUSION_STENCILS = {
+    'floyd-steinberg': [
+        (0, 1, 7 / 16), (1, -1, 3 / 16), (1, 0, 5 / 16), (1, 1, 1 / 16)],
+    'atkinson': [
+        (0, 1, 1 / 8), (0, 2, 1 / 8), (1, -1, 1 / 8), (1, 0, 1 / 8),
+        (1, 1, 1 / 8), (2, 0, 1 / 8)],
+    'jarvis-judice-ninke': [
+        (0, 1, 7 / 48), (0, 2, 5 / 48), (1, -2, 3 / 48), (1, -1, 5 / 48),
+        (1, 0, 7 / 48), (1, 1, 5 / 48), (1, 2, 3 / 48), (2, -2, 1 / 48),
+        (2, -1, 3 / 48), (2, 0, 5 / 48), (2, 1, 3 / 48), (2, 2, 1 / 48)],
+    'stucki': [
+        (0, 1, 8 / 42), (0, 2, 4 / 42), (1, -2, 2 / 42), (1, -1, 4 / 42),
+        (1, 0, 8 / 42), (1, 1, 4 / 42), (1, 2, 2 / 42), (2, -2, 1 / 42),
+        (2, -1, 2 / 42), (2, 0, 4 / 42), (2, 1, 2 / 42), (2, 2, 1 / 42)],
+    'burkes': [
+        (0, 1, 8 / 32), (0, 2, 4 / 32), (1, -2, 2 / 32), (1, -1, 4 / 32),
+        (1, 0, 8 / 32), (1, 1, 4 / 32), (1, 2, 2 / 32)],
+    'sierra3': [
+        (0, 1, 5 / 32), (0, 2, 3 / 32), (1, -2, 2 / 32), (1, -1, 4 / 32),
+        (1, 0, 5 / 32), (1, 1, 4 / 32), (1, 2, 2 / 32), (2, -1, 2 / 32),
+        (2, 0, 3 / 32), (2, 1, 2 / 32)],
+    'sierra2': [
+        (0, 1, 4 / 16), (0, 2, 3 / 16), (1, -2, 1 / 16), (1, -1, 2 / 16),
+        (1, 0, 3 / 16), (1, 1, 2 / 16), (1, 2, 1 / 16)],
+    'sierra-2-4a': [
+        (0, 1, 2 / 4), (1, -1, 1 / 4), (1, 0, 1 / 4)],
+}
+
+# Split into the (offsets, weights) array pairs the kernel consumes.
+_DIFFUSION_COEFFS = {
+    name: (np.array([(dy, dx) for dy, dx, _ in stencil], dtype=np.int64),
+           np.array([w for _, _, w in stencil], dtype=np.float32))
+    for name, stencil in _DIFFUSION_STENCILS.items()
+}
+
+
+# Classic 8x8 Bayer (dispersed-dot) ordered-dither matrix, values 0..63.
+_BAYER_8X8 = np.array([
+    [ 0, 32,  8, 40,  2, 34, 10, 42],
+    [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44,  4, 36, 14, 46,  6, 38],
+    [60, 28, 52, 20, 62, 30, 54, 22],
+    [ 3, 35, 11, 43,  1, 33,  9, 41],
+    [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47,  7, 39, 13, 45,  5, 37],
+    [63, 31, 55, 23, 61, 29, 53, 21],
+], dtype=np.uint8)
+
+# 8x8 clustered-dot halftone matrix (dual dot), values 0..63.
+_CLUSTER_8X8 = np.array([
+    [24, 10, 12, 26, 35, 47, 49, 37],
+    [ 8,  0,  2, 14, 45, 59, 61, 51],
+    [22,  6,  4, 16, 43, 57, 63, 53],
+    [30, 20, 18, 28, 33, 41, 55, 39],
+    [34, 46, 48, 36, 25, 11, 13, 27],
+    [44, 58, 60, 50,  9,  1,  3, 15],
+    [42, 56, 62, 52, 23,  7,  5, 17],
+    [32, 40, 54, 38, 31, 21, 19, 29],
+], dtype=np.uint8)
+
+
+def _to_mode1(arr):
+    """
+    Pack a uint8 0/255 array straight into a mode-'1' image with
+    np.packbits, skipping the extra full-image pass PIL's convert('1')
+    would make over an already-bilevel buffer.
+    """
+    h, w = arr.shape
+    packed = np.packbits(arr >= 128, axis=1)
+    return Image.frombytes('1', (w, h), packed.tobytes())
+
+
+@functools.lru_cache(maxsize=16)
+def _threshold_map(kind, w, h):
+    """
+    Full-size tiled threshold map for an ordered-dither matrix. There are
+    only a handful of label sizes, so the tile-and-crop runs once per
+    (matrix, size) and every later print is just the compare.
+    """
+    matrix = _BAYER_8X8 if kind == 'bayer' else _CLUSTER_8X8
+    # Scale 0..63 matrix values into the middle of each 0..255 bucket.
+    thresholds = matrix.astype(np.uint16) * 4 + 2
+    return np.tile(thresholds, ((h + 7) // 8, (w + 7) // 8))[:h, :w]
+
+
+def _ordered_dither(img, kind):
+    """
+    Ordered (threshold-matrix) dither of an L-mode image against a tiled
+    8x8 matrix. For a bilevel palette this is a single vectorized compare,
+    with no RGB round-trip. Returns a 0/255 uint8 array.
+    """
+    arr = np.asarray(img, dtype=np.uint8)
+    h, w = arr.shape
+    return (arr > _threshold_map(kind, w, h)).astype(np.uint8) * 255
+
+
+def _error_diffusion(buf, offsets, weights):
+    """
+    Serial error-diffusion dither over a float32 grayscale buffer.
+    Quantizes in place along the scan order, pushing the residual error
+    to the neighbours described by (offsets, weights).
+    """
+    h, w = buf.shape
+    out = np.empty((h, w), np.uint8)
+    for y in range(h):
+        for x in range(w):
+            old = buf[y, x]
+            new = 255.0 if old > 127.5 else 0.0
+            out[y, x] = np.uint8(new)
+            err = old - new
+            for k in range(offsets.shape[0]):
+                ny = y + offsets[k, 0]
+                nx = x + offsets[k, 1]
+                if 0 <= ny < h and 0 <= nx < w:
+                    buf[ny, nx] += err * weights[k]
+    return out
+
+
+if _HAVE_NUMBA:
+    _error_diffusion = njit(cache=True, fastmath=True, nogil=True)(_error_diffusion)
+
+    @njit(cache=True, fastmath=True, parallel=True, nogil=True)
+    def _error_diffusion_banded(buf, offsets, weights, band):
+        """
+        Band-parallel variant for large buffers: each band of rows is
+        diffused serially but bands run concurrently, with error that
+        would cross a band boundary dropped. At 256+ rows per band the
+        seams are invisible after 1-bit quantization.
+        """
+        h, w = buf.shape
+        out = np.empty((h, w), np.uint8)
+        nbands = (h + band - 1) // band
+        for b in prange(nbands):
+            y0 = b * band
+            y1 = min(y0 + band, h)
+            for y in range(y0, y1):
+                for x in range(w):
+                    old = buf[y, x]
+                    new = 255.0 if old > 127.5 else 0.0
+                    out[y, x] = np.uint8(new)
+                    err = old - new
+                    for k in range(offsets.shape[0]):
+                        ny = y + offsets[k, 0]
+                        nx = x + offsets[k, 1]
+                        if ny < y1 and 0 <= nx < w:
+                            buf[ny, nx] += err * weights[k]
+        return out
+
+
+def _error_diffusion_int(buf, offsets, weights_q16):
+    """
+    Interpreter fallback for when numba is missing: int16 error buffer,
+    branchless threshold, and Q16 fixed-point weights, which roughly
+    doubles throughput over the float/branchy equivalent in pure Python.
+    """
+    h, w = buf.shape
+    out = np.empty((h, w), np.uint8)
+    nk = offsets.shape[0]
+    for y in range(h):
+        for x in range(w):
+            old = buf[y, x]
+            new = 255 * (old > 127)  # branchless bilevel quantize
+            out[y, x] = new
+            err = old - new
+            for k in range(nk):
+                ny = y + offsets[k, 0]
+                nx = x + offsets[k, 1]
+                if 0 <= ny < h and 0 <= nx < w:
+                    buf[ny, nx] += (err * weights_q16[k]) >> 16
+    return out
+
+
+# ASCII characters ordered from light to dark by visual density
+# Using a 70-level character set for much smoother gradation
+_ASCII_CHARS = " .'`^\",:;Il!i><~+_-?][}{1)(|\\/tfjrxnuvczMW&8%B@$"
+
+
+@functools.lru_cache(maxsize=8)
+def _ascii_glyphs(font_height_px):
+    """
+    Load a monospace font at the given pixel height and prerender one
+    L-mode tile per ramp character. Cached so repeated ascii_dither
+    calls skip the FreeType face setup and glyph rasterization.
+    Returns (tiles, char_width, char_height).
     """
-    # ASCII characters ordered from light to dark by visual density
-    # Using a 70-level character set for much smoother gradation
-    ascii_chars = " .'`^\",:;Il!i><~+_-?][}{1)(|\\/tfjrxnuvczMW&8%B@$"
-    
-    # Font size: 2pt at 300 DPI = 2 * 300/72 = ~8 pixels tall
-    # Smaller font = more characters = higher resolution
-    font_size = 2  # points
-    dpi = 300
-    font_height_px = int(font_size * dpi / 72)  # ~8 pixels
-    
     # Try to use a monospace font for consistent character width
     # Fall back to default if not available
     try:
@@ -34,80 +255,127 @@ def ascii_dither(img, target_w, target_h):
         except:
             # Fall back to default font
             font = ImageFont.load_default()
-    
+
     # Calculate character dimensions using getbbox
     # Test with a dense character to get max dimensions
     bbox = font.getbbox("@")
     char_width = bbox[2] - bbox[0]
     char_height = bbox[3] - bbox[1]
-    
+
+    # Prerender each character once to a small tile; pasting tiles is a
+    # plain blit, so FreeType runs len(_ASCII_CHARS) times instead of
+    # once per cell (cols*rows can reach tens of thousands).
+    tiles = []
+    for char in _ASCII_CHARS:
+        tile = Image.new('L', (char_width, char_height), 255)
+        ImageDraw.Draw(tile).text((-bbox[0], -bbox[1]), char, fill=0, font=font)
+        tiles.append(tile)
+    return tiles, char_width, char_height
+
+
+def ascii_dither(img, target_w, target_h):
+    """
+    Convert grayscale image to ASCII art dithering.
+    Uses characters with different densities to represent brightness levels.
+    Font size optimized for 300 DPI printing.
+    """
+    # Font size: 2pt at 300 DPI = 2 * 300/72 = ~8 pixels tall
+    # Smaller font = more characters = higher resolution
+    font_size = 2  # points
+    dpi = 300
+    font_height_px = int(font_size * dpi / 72)  # ~8 pixels
+
+    tiles, char_width, char_height = _ascii_glyphs(font_height_px)
+
     # Calculate how many characters fit in target dimensions
     cols = target_w // char_width
     rows = target_h // char_height
-    
-    # Resize image to match character grid
-    img_resized = img.resize((cols, rows), Image.Resampling.LANCZOS)
-    
+
+    # Resize image to match character grid. BOX (area average) is much
+    # cheaper than LANCZOS for this steep downscale, and any difference
+    # vanishes once each cell collapses to a single ramp character.
+    img_resized = img.resize((cols, rows), Image.Resampling.BOX)
+
     # Create output image
     output = Image.new('L', (target_w, target_h), 255)  # White background
-    draw = ImageDraw.Draw(output)
-    
-    # Convert each pixel to ASCII character
-    pixels = img_resized.load()
+
+    # Map brightness to character indices in one vectorized shot,
+    # inverting because we want dark chars for dark areas.
+    arr = np.asarray(img_resized, dtype=np.int32)
+    idx = (255 - arr) * (len(_ASCII_CHARS) - 1) // 255
+
+    # Blit the prerendered tile for each cell
     for row in range(rows):
         for col in range(cols):
-            # Get brightness (0=black, 255=white)
-            brightness = pixels[col, row]
-            
-            # Map brightness to ASCII character
-            # Invert because we want dark chars for dark areas
-            char_index = int((255 - brightness) / 255 * (len(ascii_chars) - 1))
-            char_index = min(char_index, len(ascii_chars) - 1)
-            char = ascii_chars[char_index]
-            
-            # Draw character
-            x = col * char_width
-            y = row * char_height
-            draw.text((x, y), char, fill=0, font=font)  # Black text
-    
+            output.paste(tiles[idx[row, col]], (col * char_width, row * char_height))
+
     return output
 
 def get_hilbert_curve(width, height):
     """
-    Generate Hilbert curve coordinates (x, y) for a rectangle.
+    Return Hilbert curve coordinates (xs, ys) for a rectangle as a pair
+    of numpy arrays in traversal order.
     Since Hilbert curves are for powers of 2, we use a larger power of 2
     and filter out coordinates outside the rectangle.
     """
     size = 1
     while size < width or size < height:
         size *= 2
-    
-    def rot(n, x, y, rx, ry):
-        if ry == 0:
-            if rx == 1:
-                x = n - 1 - x
-                y = n - 1 - y
-            return y, x
-        return x, y
-
-    def d2xy(n, d):
-        t = d
-        x = y = 0
-        s = 1
-        while s < n:
-            rx = 1 & (t // 2)
-            ry = 1 & (t ^ rx)
-            x, y = rot(s, x, y, rx, ry)
-            x += s * rx
-            y += s * ry
-            t //= 4
-            s *= 2
-        return x, y
-
-    for d in range(size * size):
-        x, y = d2xy(size, d)
-        if x < width and y < height:
-            yield x, y
+
+    # Vectorized d2xy: decode every curve index at once, two bits per
+    # level, with the rotate/reflect step expressed as np.where selects
+    # instead of a per-point Python call.
+    t = np.arange(size * size, dtype=np.int64)
+    x = np.zeros_like(t)
+    y = np.zeros_like(t)
+    s = 1
+    while s < size:
+        rx = 1 & (t >> 1)
+        ry = 1 & (t ^ rx)
+        swap = ry == 0
+        flip = swap & (rx == 1)
+        xf = np.where(flip, s - 1 - x, x)
+        yf = np.where(flip, s - 1 - y, y)
+        x = np.where(swap, yf, xf) + s * rx
+        y = np.where(swap, xf, yf) + s * ry
+        t >>= 2
+        s *= 2
+
+    mask = (x < width) & (y < height)
+    return x[mask].astype(np.int32), y[mask].astype(np.int32)
+
+def _riemersma_core(flat, path, weights, depth):
+    """
+    Serial Riemersma inner loop over a flat float64 buffer: walk the
+    Hilbert path, quantize with a weighted ring buffer of recent errors.
+    Compiled with numba when available (the recurrence is strictly
+    serial, so no parallel=True).
+    """
+    out = np.zeros(flat.shape[0], dtype=np.uint8)
+    error_queue = np.zeros(depth, dtype=np.float64)
+    head = 0
+    for i in range(path.shape[0]):
+        j = path[i]
+        # Expected value with weighted error history; error_queue[head]
+        # holds the most recent error, matching weights[0]
+        total_error = 0.0
+        for k in range(depth):
+            total_error += error_queue[(head + k) % depth] * weights[k]
+        old_pixel = flat[j] + total_error
+
+        # Quantize
+        new_pixel = 255.0 if old_pixel > 127.5 else 0.0
+        out[j] = np.uint8(new_pixel)
+
+        # Push the newest error
+        head = (head - 1) % depth
+        error_queue[head] = old_pixel - new_pixel
+    return out
+
+
+if _HAVE_NUMBA:
+    _riemersma_core = njit(cache=True, fastmath=True, nogil=True)(_riemersma_core)
+
 
 def riemersma_dither(img, history_depth=16, ratio=0.1):
     """
@@ -116,41 +384,135 @@ def riemersma_dither(img, history_depth=16, ratio=0.1):
     ratio: exponential decay ratio for error weighting
     """
     # Convert to float and extract pixels
-    img_data = np.array(img, dtype=float)
+    img_data = np.array(img, dtype=np.float64)
     h, w = img_data.shape
-    
-    # Pre-calculate weights
-    weights = np.zeros(history_depth)
-    for i in range(history_depth):
-        weights[i] = ratio ** (i / (history_depth - 1))
-    weights /= np.sum(weights)  # Normalize
-    
-    # Error queue
-    error_queue = np.zeros(history_depth)
-    
-    # Process along Hilbert curve
-    output = np.zeros_like(img_data, dtype=np.uint8)
-    for x, y in get_hilbert_curve(w, h):
-        # Calculate expected value with weighted error history
-        total_error = np.sum(error_queue * weights)
-        old_pixel = img_data[y, x] + total_error
-        
-        # Quantize
-        new_pixel = 255 if old_pixel > 127.5 else 0
-        output[y, x] = new_pixel
-        
-        # Update error history
-        error = old_pixel - new_pixel
-        error_queue = np.roll(error_queue, 1)
-        error_queue[0] = error
-        
-    return Image.fromarray(output, mode='L')
+
+    # Pre-calculate normalized exponential-decay weights
+    weights = ratio ** (np.arange(history_depth) / (history_depth - 1))
+    weights /= weights.sum()
+
+    # The Hilbert traversal as flat indices, straight from the vectorized
+    # decoder.
+    flat = img_data.ravel()
+    xs, ys = get_hilbert_curve(w, h)
+    path = ys.astype(np.int64) * w + xs
+
+    out_flat = _riemersma_core(flat, path, weights, history_depth)
+    return Image.fromarray(out_flat.reshape(h, w), mode='L')
+
+# --- Dither dispatch
+# One handler per algorithm, built once at import so the hot path is a
+# single dict lookup instead of a re-evaluated if/elif chain. Handlers
+# take the prepared L-mode canvas plus an options dict and return either
+# a mode-'1' image or a 0/255 uint8 array; prepare_image packs or wraps
+# the array depending on the caller's requested mode.
+
+def _dither_floyd(img, opts):
+    return img.convert('1', dither=Image.FLOYDSTEINBERG)
+
+
+def _dither_threshold(img, opts):
+    return img.convert('1', dither=Image.NONE)
+
+
+def _dither_bayer(img, opts):
+    return _ordered_dither(img, 'bayer')
+
+
+def _dither_cluster(img, opts):
+    return _ordered_dither(img, 'cluster')
+
+
+@functools.lru_cache(maxsize=1)
+def _bilevel_palette():
+    """The shared black/white hitherdither palette, built on first use."""
+    return hitherdither.palette.Palette([(0, 0, 0), (255, 255, 255)])
+
+
+def _dither_yliluoma(img, opts):
+    return hitherdither.ordered.yliluoma.yliluomas_1_ordered_dithering(
+        img.convert('RGB'), _bilevel_palette(), order=8
+    ).convert('1')
+
+
+def _dither_ascii(img, opts):
+    arr = np.asarray(ascii_dither(img, img.width, img.height))
+    return (arr >= 128).astype(np.uint8) * 255
+
+
+def _dither_riemersma(img, opts):
+    out = riemersma_dither(img, history_depth=opts['riemersma_history'],
+                           ratio=opts['riemersma_ratio'])
+    return np.asarray(out)
+
+
+def _make_diffusion_handler(name):
+    # Close over the coefficient arrays so the per-call work is only the
+    # buffer copy and the kernel itself.
+    offsets, weights = _DIFFUSION_COEFFS[name]
+    weights_q16 = np.round(weights * 65536).astype(np.int32)
+
+    def handler(img, opts):
+        if _HAVE_NUMBA:
+            buf = np.asarray(img, dtype=np.float32).copy()
+            # Large labels get the band-parallel kernel; small ones stay
+            # serial, where thread startup would outweigh the work.
+            if buf.size >= 1 << 20:
+                out = _error_diffusion_banded(buf, offsets, weights, 256)
+            else:
+                out = _error_diffusion(buf, offsets, weights)
+        else:
+            buf = np.asarray(img, dtype=np.int16).copy()
+            out = _error_diffusion_int(buf, offsets, weights_q16)
+        return out
+    return handler
+
+
+DITHER_HANDLERS = {
+    'floyd': _dither_floyd,
+    'none': _dither_threshold,
+    'bayer': _dither_bayer,
+    'yliluoma': _dither_yliluoma,
+    'cluster': _dither_cluster,
+    'ascii': _dither_ascii,
+    'riemersma': _dither_riemersma,
+}
+for _name in _DIFFUSION_COEFFS:
+    DITHER_HANDLERS[_name] = _make_diffusion_handler(_name)
+
+
+def warm_dither_kernels():
+    """
+    Run each dither handler once on a tiny image so numba compiles (or
+    loads its on-disk cache for) the diffusion and riemersma kernels
+    before the first real label. Cheap enough to call unconditionally;
+    safe from a background thread.
+    """
+    img = Image.fromarray(np.full((16, 16), 128, dtype=np.uint8), 'L')
+    opts = {'riemersma_history': 4, 'riemersma_ratio': 0.5}
+    for name, handler in DITHER_HANDLERS.items():
+        if name == 'yliluoma':
+            continue  # pure Python, nothing to compile
+        handler(img, opts)
+    if _HAVE_NUMBA:
+        # The tiny image above stays under the banded-kernel threshold,
+        # but full-size labels take _error_diffusion_banded - compile it
+        # too. With band >= rows the single band degenerates to the
+        # serial pass, so the warmup stays cheap.
+        offsets, weights = _DIFFUSION_COEFFS['floyd-steinberg']
+        buf = np.full((16, 16), 128.0, dtype=np.float32)
+        _error_diffusion_banded(buf, offsets, weights, 256)
+
 
 # Label Specifications
 # ID is the CUPS PageSize name.
 # Dimensions are in pixels at 300 DPI.
-# width_points and height_points are for verification/reference (1/72 inch).
-LABEL_SPECS = {
+# Frozen into an immutable namedtuple per label at import time, with the
+# target aspect ratio precomputed, so the hot path does attribute loads
+# instead of repeated dict lookups.
+LabelSpec = namedtuple('LabelSpec', 'name id width_px height_px rotate brand target_ratio')
+
+_RAW_LABEL_SPECS = {
     '4x6': {
         'name': 'Shipping (4" x 6")',
         'id': 'w288h432',
@@ -185,7 +547,7 @@ LABEL_SPECS = {
     },
     '30334': {
         'name': 'Dymo 2-1/4" x 1-1/4"',
-        'id': 'w162h90', 
+        'id': 'w162h90',
         'width_px': 675, # 2.25 * 300
         'height_px': 375, # 1.25 * 300
         'rotate': False, # Width > Height, might not need rotation depending on roll
@@ -217,58 +579,153 @@ LABEL_SPECS = {
     }
 }
 
+LABEL_SPECS = {
+    code: LabelSpec(target_ratio=raw['width_px'] / raw['height_px'], **raw)
+    for code, raw in _RAW_LABEL_SPECS.items()
+}
+
+# Printer names matched when auto-picking a destination. The compiled
+# pattern scans a name in one pass instead of one lower() + substring
+# search per keyword.
+PREFERRED_PRINTER_KEYWORDS = ("dymo", "rx106", "comer")
+_PREFERRED_PRINTER_RE = re.compile("|".join(PREFERRED_PRINTER_KEYWORDS),
+                                   re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1)
 def list_printers():
-    """Helper to list available printer names on macOS."""
+    """
+    Helper to list available printer names on macOS.
+    Cached for the process lifetime - 'lpstat' costs a fork+exec every
+    call, which adds up when printing in a loop.
+    """
     try:
-        # 'lpstat -e' lists all distinct printer destinations
-        result = subprocess.check_output(['lpstat', '-e'], text=True)
+        # 'lpstat -e' lists all distinct printer destinations.
+        # close_fds=False keeps us on CPython's posix_spawn fast path.
+        result = subprocess.check_output(['lpstat', '-e'], text=True,
+                                         close_fds=False)
         printers = result.strip().split('\n')
         return printers
     except FileNotFoundError:
         print("Error: 'lpstat' command not found. Are you on macOS?")
         return []
 
-def prepare_image(image_path, label_spec, brightness=1.2, contrast=1.0, dither_alg='floyd', riemersma_history=16, riemersma_ratio=0.1):
+
+def autopick_printer():
+    """Return the first printer matching a preferred keyword, or None."""
+    for p in list_printers():
+        if _PREFERRED_PRINTER_RE.search(p):
+            return p
+    return None
+
+def _to_pbm(img):
     """
-    Prepare image for a specific label.
+    Encode a 1-bit image as raw PBM (P4). CUPS decodes the bitmap right
+    back to pixels, so PNG's zlib pass is wasted CPU; PBM is a two-line
+    header plus the MSB-packed rows Pillow already holds for mode '1'.
     """
-    img = Image.open(image_path).convert('L')
+    if img.mode != '1':
+        img = img.convert('1')
+    # Pillow packs 1 = white; PBM wants 1 = black, so flip the bits.
+    bits = np.frombuffer(img.tobytes(), dtype=np.uint8) ^ 0xFF
+    return b'P4\n%d %d\n' % img.size + bits.tobytes()
 
-    # --- Lightening
 
-    enhancer = ImageEnhance.Brightness(img)
-    img= enhancer.enhance(brightness)
-    
-    # High-Contrast Pre-processing
-    # This helps eliminate 'gray noise' that causes banding in thermal prints
-    enhancer = ImageEnhance.Contrast(img)
-    img = enhancer.enhance(contrast) 
-    
-    # 2. Orientation
+def _result_cache_path(image_path, label_spec, brightness, contrast, dither_alg,
+                       riemersma_history, riemersma_ratio):
+    """
+    Cache file for a fully processed label image, keyed by the source bytes
+    and every parameter that affects the output. Reprinting the same label
+    (the common case for shipping labels) then skips the whole pipeline.
+    """
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(repr((label_spec.id, brightness, contrast, dither_alg,
+                        riemersma_history, riemersma_ratio)).encode())
+    return Path.home() / '.cache' / 'thermal_print' / f'{digest.hexdigest()}.png'
+
+def prepare_image(image_path, label_spec, brightness=1.2, contrast=1.0, dither_alg='floyd', riemersma_history=16, riemersma_ratio=0.1, return_mode='1'):
+    """
+    Prepare image for a specific label. Accepts either a path or an
+    already-decoded PIL image; the latter skips the file read, decode
+    and disk cache (the GUI holds its source decoded and re-runs only
+    the pixel ops per preview).
+
+    return_mode selects '1' (packed bilevel, what lp wants) or 'L'
+    (0/255 bytes, which resizes and displays much faster in Tk).
+    """
+    if isinstance(image_path, Image.Image):
+        cache_file = None
+        img = image_path
+    else:
+        cache_file = _result_cache_path(image_path, label_spec, brightness, contrast,
+                                        dither_alg, riemersma_history, riemersma_ratio)
+        if cache_file.exists():
+            cached = Image.open(cache_file)
+            cached.load()
+            return cached.convert('L') if return_mode == 'L' else cached
+
+        img = Image.open(image_path)
+        if img.format == 'JPEG':
+            # Ask libjpeg for a reduced DCT-scale grayscale decode. draft picks
+            # the largest scale still >= 2x the label, so the Lanczos pass keeps
+            # its quality while starting from a much smaller buffer.
+            img.draft('L', (label_spec.width_px * 2, label_spec.height_px * 2))
+    img = img.convert('L')
+
+    # From here to the final dither the image lives as a single 2-D uint8
+    # array: one conversion in, one conversion out, instead of a chain of
+    # Pillow objects each allocating and re-walking the full buffer.
+    arr = np.asarray(img, dtype=np.uint8)
+
+    # 1. Orientation (decided first: np.rot90 on the raw view is a zero-copy
+    # stride flip, and everything downstream then runs on the correctly
+    # oriented buffer without a second pass).
     # Automatically match the long side of the image to the long side of the label.
-    target_w = label_spec['width_px']
-    target_h = label_spec['height_px']
-    
-    img_is_landscape = img.width > img.height
+    target_w = label_spec.width_px
+    target_h = label_spec.height_px
+
+    img_is_landscape = arr.shape[1] > arr.shape[0]
     label_is_landscape = target_w > target_h
-    
+
     if img_is_landscape != label_is_landscape:
         # Orientations don't match, rotate 90 degrees
-        img = img.rotate(90, expand=True)
-    
+        arr = np.rot90(arr)
+
+    # --- Brightness + contrast in one pass
+    # Both enhancers are point operations on an L-mode image, so their
+    # composition collapses into a single 256-entry lookup table.
+    # Contrast pivots around the brightened image mean, matching
+    # ImageEnhance.Contrast; the pre-processing helps eliminate 'gray
+    # noise' that causes banding in thermal prints.
+    if brightness != 1.0 or contrast != 1.0:
+        # Brightness first, with the enhancer's own float32 truncation
+        # and clipping, because the contrast pivot is the mean of the
+        # *brightened* image - computed by folding the histogram through
+        # the brightness LUT, never from the raw pixels.
+        ramp = np.arange(256, dtype=np.float32)
+        bright = np.clip(np.floor(ramp * np.float32(brightness)), 0, 255)
+        hist = np.bincount(arr.ravel(), minlength=256)
+        # ImageEnhance.Contrast rounds the pivot to an int
+        mean = int(float(hist @ bright.astype(np.float64)) / arr.size + 0.5)
+        lut = np.clip(np.floor(np.float32(mean) + np.float32(contrast)
+                               * (bright - np.float32(mean))),
+                      0, 255).astype(np.uint8)
+        arr = lut[arr]
+
     # Maintain aspect ratio?
     # Strategy: Fit within target dimensions, centering? Or fill?
     # Original logic was "Target 694px height" (which was actually width of roll).
-    # dymo_print.py's original logic seemed to assume fitting 
+    # dymo_print.py's original logic seemed to assume fitting
     # to the 694px dimension (which is the roll width).
-    
+
     # Let's try to fit to the label dimensions while maintaining aspect ratio,
     # then center on a white background.
-    
-    img_ratio = img.width / img.height
-    target_ratio = target_w / target_h
-    
-    if img_ratio > target_ratio:
+
+    img_ratio = arr.shape[1] / arr.shape[0]
+
+    if img_ratio > label_spec.target_ratio:
         # Image is wider than target
         new_w = target_w
         new_h = int(target_w / img_ratio)
@@ -276,67 +733,39 @@ def prepare_image(image_path, label_spec, brightness=1.2, contrast=1.0, dither_a
         # Image is taller than target
         new_h = target_h
         new_w = int(target_h * img_ratio)
-        
-    img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-    
-    # Create canvas
-    canvas = Image.new('L', (target_w, target_h), 255)
-    # Center
+
+    arr = _resize_l(arr, new_w, new_h)
+    # libvips rounds scale factors, so trust the returned size
+    new_h, new_w = arr.shape
+
+    # Center on a white canvas
+    canvas = np.full((target_h, target_w), 255, dtype=np.uint8)
     paste_x = (target_w - new_w) // 2
     paste_y = (target_h - new_h) // 2
-    canvas.paste(img, (paste_x, paste_y))
-    img = canvas
-
-    # 4. Convert to 1-bit monochrome
-    if dither_alg == 'floyd':
-        return img.convert('1', dither=Image.FLOYDSTEINBERG)
-    elif dither_alg == 'bayer':
-        # hitherdither requires an RGB image for some reason, or at least works better with palette
-        # But for 1-bit, we can try direct. 
-        # Actually hitherdither.ordered.bayer.bayer_dithering works on PIL images.
-        # Let's check the palette. 
-        # We need a bilevel palette.
-        palette = hitherdither.palette.Palette(
-            [(0, 0, 0), (255, 255, 255)]
-        )
-        img_rgb = img.convert("RGB")
-        return hitherdither.ordered.bayer.bayer_dithering(
-            img_rgb, palette, [255/2, 255/2, 255/2], order=8
-        ).convert('1')
-    elif dither_alg == 'yliluoma':
-         palette = hitherdither.palette.Palette(
-            [(0, 0, 0), (255, 255, 255)]
-        )
-         img_rgb = img.convert("RGB")
-         return hitherdither.ordered.yliluoma.yliluomas_1_ordered_dithering(
-            img_rgb, palette, order=8
-        ).convert('1')
-    elif dither_alg == 'cluster':
-         palette = hitherdither.palette.Palette(
-            [(0, 0, 0), (255, 255, 255)]
-        )
-         img_rgb = img.convert("RGB")
-         return hitherdither.ordered.cluster.cluster_dot_dithering(
-            img_rgb, palette, thresholds=[255/2, 255/2, 255/2], order=8
-        ).convert('1')
-    elif dither_alg in ['floyd-steinberg', 'atkinson', 'jarvis-judice-ninke', 'stucki', 'burkes', 'sierra3', 'sierra2', 'sierra-2-4a']:
-        palette = hitherdither.palette.Palette(
-            [(0, 0, 0), (255, 255, 255)]
-        )
-        img_rgb = img.convert("RGB")
-        return hitherdither.diffusion.error_diffusion_dithering(
-            img_rgb, palette, method=dither_alg, order=8
-        ).convert('1')
-    elif dither_alg == 'ascii':
-        # ASCII art dithering - renders text characters based on brightness
-        ascii_img = ascii_dither(img, target_w, target_h)
-        return ascii_img.convert('1')
-    elif dither_alg == 'riemersma':
-        # Riemersma dithering - high quality Hilbert curve error diffusion
-        return riemersma_dither(img, history_depth=riemersma_history, ratio=riemersma_ratio).convert('1')
+    canvas[paste_y:paste_y + new_h, paste_x:paste_x + new_w] = arr
+    img = Image.fromarray(canvas)
+
+    # 4. Convert to 1-bit monochrome (falls back to simple threshold for
+    # unknown algorithms, matching the old else branch)
+    opts = {'riemersma_history': riemersma_history,
+            'riemersma_ratio': riemersma_ratio}
+    result = DITHER_HANDLERS.get(dither_alg, _dither_threshold)(img, opts)
+
+    # Numpy-producing handlers hand back a 0/255 array; pack it only when
+    # the caller wants mode '1' (PIL-producing handlers are already '1').
+    if isinstance(result, np.ndarray):
+        packed = _to_mode1(result)
+        final = Image.fromarray(result, 'L') if return_mode == 'L' else packed
     else:
-        # Fallback to simple threshold if unknown or 'none'
-        return img.convert('1', dither=Image.NONE)
+        packed = result
+        final = result.convert('L') if return_mode == 'L' else result
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # 1-bit content compresses near-optimally even at zlib level 1, so
+        # skip the expensive filter/optimize heuristics when saving the cache.
+        packed.save(cache_file, optimize=False, compress_level=1)
+    return final
 
 def print_raw(image_path, printer_name, label_code='4x6', brightness=1.2, contrast=1.0, dither_alg='floyd', riemersma_history=16, riemersma_ratio=0.1, custom_options=None):
     if label_code not in LABEL_SPECS:
@@ -345,20 +774,75 @@ def print_raw(image_path, printer_name, label_code='4x6', brightness=1.2, contra
 
     spec = LABEL_SPECS[label_code]
     final_image = prepare_image(image_path, spec, brightness, contrast, dither_alg, riemersma_history, riemersma_ratio)
-    temp_file = "thermal_final.png"
-    final_image.save(temp_file)
+    _send_to_printer(final_image, printer_name, spec, custom_options)
+    print(f"Sent {image_path} to {printer_name} using media {spec.id}")
+
+
+def build_print_job(image_path, printer_name, label_code='4x6', brightness=1.2, contrast=1.0, dither_alg='floyd', riemersma_history=16, riemersma_ratio=0.1, custom_options=None):
+    """
+    Prepare one label and return the (lp command, PBM payload) pair
+    without submitting it. Lets a caller own the lp process - the GUI
+    polls a Popen handle from the Tk event loop rather than parking a
+    thread in wait() for the duration of the job.
+    """
+    spec = LABEL_SPECS[label_code]
+    final_image = prepare_image(image_path, spec, brightness, contrast, dither_alg, riemersma_history, riemersma_ratio)
+    return _lp_command(printer_name, spec, custom_options) + ["-"], _to_pbm(final_image)
 
+
+def _run_print_job(cmd, payload):
+    """
+    Feed payload to cmd's stdin and wait for it to finish. Spawns via
+    os.posix_spawn where available: subprocess's fork() momentarily
+    duplicates the whole Python heap (Pillow + numpy + JIT state) just
+    to exec lp. Raises CalledProcessError on a non-zero exit, matching
+    the subprocess fallback.
+    """
+    exe = shutil.which(cmd[0]) if hasattr(os, 'posix_spawn') else None
+    if exe is None:
+        subprocess.run(cmd, input=payload, check=True)
+        return
+    read_fd, write_fd = os.pipe()
+    try:
+        pid = os.posix_spawn(exe, cmd, os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, read_fd, 0),
+            (os.POSIX_SPAWN_CLOSE, write_fd),
+        ])
+    except BaseException:
+        # The write end never reaches the fdopen below, so it would
+        # leak if the spawn itself fails.
+        os.close(write_fd)
+        raise
+    finally:
+        os.close(read_fd)
+    try:
+        with os.fdopen(write_fd, 'wb') as child_stdin:
+            child_stdin.write(payload)
+    except BrokenPipeError:
+        # lp exits before draining stdin when it rejects the job outright
+        # (unknown destination, bad option), and label payloads far exceed
+        # the pipe buffer. Swallow the EPIPE like subprocess._stdin_write
+        # does and report the child's exit status below instead.
+        pass
+    _, status = os.waitpid(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def _lp_command(printer_name, spec, custom_options=None):
+    """Build the lp invocation (minus the input argument) for a spec."""
     # COMMAND CHANGES:
     # Use spec ID for PageSize
     cmd = [
-        "lp", 
-        "-d", printer_name, 
-        "-o", f"PageSize={spec['id']}",
+        "lp",
+        "-d", printer_name,
+        "-o", f"PageSize={spec.id}",
         "-o", "scaling=100",
         "-o", "ppi=300",
-        temp_file
+        "-o", "document-format=image/x-portable-bitmap",
     ]
-    
+
     # Add default Dymo options if it's a Dymo printer and no custom options provide them
     if "dymo" in printer_name.lower():
         dymo_defaults = ["DymoPrintDensity=Medium", "DymoPrintQuality=Graphics"]
@@ -366,9 +850,8 @@ def print_raw(image_path, printer_name, label_code='4x6', brightness=1.2, contra
         for default_opt in dymo_defaults:
             key = default_opt.split('=')[0]
             if not any(key in opt for opt in existing_opts):
-                cmd.insert(-1, "-o")
-                cmd.insert(-1, default_opt)
-    
+                cmd.extend(["-o", default_opt])
+
     if custom_options:
         # custom_options can be a list or a string of space-separated options
         if isinstance(custom_options, str):
@@ -377,27 +860,85 @@ def print_raw(image_path, printer_name, label_code='4x6', brightness=1.2, contra
             extra_opts = shlex.split(custom_options)
         else:
             extra_opts = custom_options
-        
+
         for opt in extra_opts:
-            cmd.insert(-1, "-o")
-            cmd.insert(-1, opt)
-    
+            cmd.extend(["-o", opt])
+
+    return cmd
+
+
+def _send_to_printer(final_image, printer_name, spec, custom_options=None):
+    """Pipe a processed label image to lp for the given spec."""
+    # Encode in memory and pipe to lp's stdin ("-") instead of round-tripping
+    # through a temp file. Raw PBM skips PNG's zlib pass entirely.
+    payload = _to_pbm(final_image)
+    _run_print_job(_lp_command(printer_name, spec, custom_options) + ["-"], payload)
+
+
+def print_many(images, printer_name, spec, custom_options=None):
+    """
+    Submit several processed labels through one lp invocation, paying the
+    fork/exec and CUPS handshake once instead of per label. lp only reads
+    a single document from stdin, so the images go through short-lived
+    temp files.
+    """
+    tmp_files = []
     try:
+        for image in images:
+            fd, name = tempfile.mkstemp(suffix='.pbm')
+            tmp_files.append(name)
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(_to_pbm(image))
+        cmd = _lp_command(printer_name, spec, custom_options) + tmp_files
         subprocess.run(cmd, check=True)
-        print(f"Sent {image_path} to {printer_name} using media {spec['id']}")
     finally:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        for name in tmp_files:
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+
+
+_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'}
+
+
+def batch_print(directory, printer_name, label_code='4x6', brightness=1.2, contrast=1.0, dither_alg='floyd', riemersma_history=16, riemersma_ratio=0.1, custom_options=None):
+    """
+    Print every image in a directory. Preprocessing runs across all cores
+    in a process pool while finished labels spool to the (serial) printer,
+    so the CPU-bound dither work overlaps the lp round-trips.
+    """
+    if label_code not in LABEL_SPECS:
+        print(f"Error: Unknown label code '{label_code}'. Available: {list(LABEL_SPECS.keys())}")
+        return
+
+    spec = LABEL_SPECS[label_code]
+    paths = sorted(p for p in Path(directory).iterdir()
+                   if p.suffix.lower() in _IMAGE_EXTENSIONS)
+    if not paths:
+        print(f"No images found in {directory}")
+        return
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [(p, executor.submit(prepare_image, str(p), spec, brightness,
+                                       contrast, dither_alg, riemersma_history,
+                                       riemersma_ratio))
+                   for p in paths]
+        print_many((future.result() for _, future in futures),
+                   printer_name, spec, custom_options)
+        for path, _ in futures:
+            print(f"Sent {path} to {printer_name} using media {spec.id}")
 
 # Usage
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Print images to Thermal Printers")
     parser.add_argument("image", nargs="?", help="Path to image file")
+    parser.add_argument("--batch", help="Print every image in a directory")
     parser.add_argument("--printer", help="Name of the printer to use")
     parser.add_argument("--brightness", type=float, default=1.2, help="Brightness factor (default: 1.2)")
     parser.add_argument("--contrast", type=float, default=1.0, help="Contrast factor (default: 1.0)")
-    parser.add_argument("--dither", choices=['floyd', 'bayer', 'yliluoma', 'cluster', 'none', 'floyd-steinberg', 'atkinson', 'jarvis-judice-ninke', 'stucki', 'burkes', 'sierra3', 'sierra2', 'sierra-2-4a', 'ascii', 'riemersma'], default='floyd', help="Dithering algorithm (default: floyd)")
+    parser.add_argument("--dither", choices=list(DITHER_HANDLERS), default='floyd', help="Dithering algorithm (default: floyd)")
     parser.add_argument("--label", default='4x6', help="Label Code (default: 4x6). Choices: " + ", ".join(LABEL_SPECS.keys()))
     parser.add_argument("--riemersma-history", type=int, default=16, help="Riemersma history depth (default: 16)")
     parser.add_argument("--riemersma-ratio", type=float, default=0.1, help="Riemersma error decay ratio (default: 0.1)")
@@ -406,27 +947,37 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     # --- STEP 1: Find your printer ---
-    if args.printer:
-        target_printer = args.printer
-    else:
+    # --printer and $DYMO_PRINTER skip the lpstat round-trip entirely.
+    target_printer = args.printer or os.environ.get('DYMO_PRINTER')
+    if not target_printer:
         available_printers = list_printers()
-        
+
         if not available_printers:
             print("No printers found! Check your connections.")
             sys.exit(1)
 
         # If "Dymo" or "RX106" or "Comer" is in the name, pick it automatically
-        target_keywords = ["dymo", "rx106", "comer"]
-        preferred_printers = [p for p in available_printers if any(kw in p.lower() for kw in target_keywords)]
-        
-        if preferred_printers:
-            target_printer = preferred_printers[0]
+        target_printer = autopick_printer()
+
+        if target_printer:
             print(f"Auto-selected printer: {target_printer}")
         else:
             print("Available printers:", available_printers)
             target_printer = input("Enter exact printer name from above: ")
 
-    # --- STEP 2: Input Image ---
+    # --- STEP 2: Input Image(s) ---
+    if args.batch:
+        if os.path.isdir(args.batch):
+            batch_print(
+                args.batch, target_printer, args.label,
+                args.brightness, args.contrast, args.dither,
+                args.riemersma_history, args.riemersma_ratio,
+                args.lp_options
+            )
+        else:
+            print("Batch directory not found.")
+        sys.exit(0)
+
     if args.image:
         target_image = args.image
     else:
@@ -435,8 +986,8 @@ if __name__ == "__main__":
     # --- STEP 3: Print ---
     if os.path.exists(target_image):
         print_raw(
-            target_image, target_printer, args.label, 
-            args.brightness, args.contrast, args.dither, 
+            target_image, target_printer, args.label,
+            args.brightness, args.contrast, args.dither,
             args.riemersma_history, args.riemersma_ratio,
             args.lp_options
         )
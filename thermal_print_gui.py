@@ -7,12 +7,52 @@ Provides interactive controls for image adjustment and real-time preview
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from PIL import Image, ImageTk
+import numpy as np
+import json
+import subprocess
 import threading
 import queue
 import sys
+from collections import OrderedDict
+from pathlib import Path
 
 # Import core functions from thermal_print
-from thermal_print import LABEL_SPECS, list_printers, prepare_image, print_raw
+from thermal_print import (LABEL_SPECS, autopick_printer, build_print_job,
+                           list_printers, prepare_image, warm_dither_kernels)
+
+# Combo box display strings, frozen once at import. LABEL_SPECS never
+# changes at runtime, so there is no reason to rebuild these list
+# comprehensions on the UI thread every time the printer selection moves.
+_ALL_LABELS = tuple(f"{code} - {spec.name}" for code, spec in LABEL_SPECS.items())
+_DYMO_LABELS = tuple(f"{code} - {spec.name}" for code, spec in LABEL_SPECS.items()
+                     if spec.brand == 'dymo')
+_GENERIC_LABELS = tuple(f"{code} - {spec.name}" for code, spec in LABEL_SPECS.items()
+                        if spec.brand == 'generic')
+
+# Largest label dimensions across all specs: no preview or print ever
+# needs more source resolution than twice this, whatever label is picked.
+_MAX_LABEL_W = max(spec.width_px for spec in LABEL_SPECS.values())
+_MAX_LABEL_H = max(spec.height_px for spec in LABEL_SPECS.values())
+
+# Last-used settings survive between launches, so a session opens with
+# the brightness/contrast/dither/label combination the user actually
+# prints with instead of cold defaults.
+_SETTINGS_PATH = Path.home() / '.thermal_print_gui.json'
+
+
+def _load_settings():
+    """Read the saved settings file, tolerating absence or corruption"""
+    try:
+        return json.loads(_SETTINGS_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+# File dialog filters, built once instead of per Open click.
+_IMAGE_FILETYPES = [
+    ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff"),
+    ("All files", "*.*"),
+]
 
 
 class ThermalPrintGUI:
@@ -26,17 +66,57 @@ class ThermalPrintGUI:
         self.original_image = None
         self.preview_image = None
         self.processed_image = None  # Store the latest fully processed PIL image
+        self._processed_arr = None   # Same pixels as a uint8 numpy array
         self.preview_queue = queue.Queue()
-        self.preview_thread = None
-        
-        # Create UI
+        self._preview_after_id = None
+        self._canvas_item = None
+        self._displayed_image = None
+        self._last_params = None
+        self._scaled_cache = None  # (source image, scale, upscaled image)
+        # Small LRU of processed previews so A/B toggling between recent
+        # parameter sets redisplays instantly instead of re-dithering.
+        self._preview_cache = OrderedDict()
+        self._preview_cache_size = 8
+        # One downscaled copy of the source per (path, mtime, label long
+        # edge): brightness/contrast/dither sweeps then rerun on a few
+        # hundred kB instead of re-thumbnailing a multi-megapixel photo.
+        self._source_cache = None  # (key, thumbnailed image)
+        # Slider readout texts pending display; flushed once per idle
+        # tick so a fast drag updates each ttk.Label at most once per
+        # frame instead of once per Tk motion event.
+        self._pending_readouts = {}
+        self._readout_flush_scheduled = False
+
+        # Single-slot request queue feeding one long-lived worker thread:
+        # a new request replaces any pending one, so stale intermediate
+        # slider values are dropped but the final value always renders.
+        self._request_slot = queue.Queue(maxsize=1)
+        # Replaced source images wait here until the worker is between
+        # jobs; closing them immediately could yank the buffer out from
+        # under an in-flight render.
+        self._retired_sources = []
+        self._preview_worker = threading.Thread(
+            target=self._preview_worker_loop, daemon=True)
+        self._preview_worker.start()
+
+        # Prime the numba dither kernels off the UI thread so the first
+        # preview doesn't stall on JIT compilation.
+        threading.Thread(target=warm_dither_kernels, daemon=True).start()
+
+        # Create UI, then put back the previous session's settings
+        self._settings = _load_settings()
         self.create_widgets()
-        
+        self._restore_settings()
+
         # Load available printers
         self.load_printers()
-        
-        # Start preview queue processor
-        self.process_preview_queue()
+
+        # Results arrive via a virtual event posted by the worker, so the
+        # mainloop stays asleep instead of polling the queue on a timer.
+        self.root.bind('<<PreviewReady>>', self._on_preview_ready)
+
+        # Drop image buffers deterministically on close
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
     
     def create_widgets(self):
         # Main container with two columns
@@ -71,12 +151,12 @@ class ThermalPrintGUI:
             variable=self.brightness_var, 
             orient=tk.HORIZONTAL,
             resolution=0.1,
-            showvalue=False
+            showvalue=False,
+            command=self._on_brightness_move
         )
         self.brightness_slider.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.brightness_label = ttk.Label(controls_frame, text="1.20")
         self.brightness_label.grid(row=1, column=1, sticky=tk.E, pady=(5, 0))
-        self.brightness_var.trace_add('write', lambda *args: self.brightness_label.config(text=f"{self.brightness_var.get():.2f}"))
         
         # Contrast slider
         ttk.Label(controls_frame, text="Contrast:").grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
@@ -86,12 +166,12 @@ class ThermalPrintGUI:
             variable=self.contrast_var, 
             orient=tk.HORIZONTAL,
             resolution=0.1,
-            showvalue=False
+            showvalue=False,
+            command=self._on_contrast_move
         )
         self.contrast_slider.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.contrast_label = ttk.Label(controls_frame, text="1.00")
         self.contrast_label.grid(row=3, column=1, sticky=tk.E, pady=(5, 0))
-        self.contrast_var.trace_add('write', lambda *args: self.contrast_label.config(text=f"{self.contrast_var.get():.2f}"))
         
         # Dithering method dropdown
         ttk.Label(controls_frame, text="Dithering Method:").grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
@@ -123,12 +203,12 @@ class ThermalPrintGUI:
             variable=self.history_depth_var,
             orient=tk.HORIZONTAL,
             resolution=1,
-            showvalue=False
+            showvalue=False,
+            command=self._on_history_depth_move
         )
         self.history_depth_slider.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.history_depth_label = ttk.Label(self.riemersma_frame, text="16")
         self.history_depth_label.grid(row=0, column=1, sticky=tk.E, pady=(5, 0))
-        self.history_depth_var.trace_add('write', lambda *args: self.history_depth_label.config(text=str(self.history_depth_var.get())))
 
         # Ratio slider
         ttk.Label(self.riemersma_frame, text="Ratio:").grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
@@ -138,12 +218,12 @@ class ThermalPrintGUI:
             variable=self.ratio_var,
             orient=tk.HORIZONTAL,
             resolution=0.1,
-            showvalue=False
+            showvalue=False,
+            command=self._on_ratio_move
         )
         self.ratio_slider.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.ratio_label = ttk.Label(self.riemersma_frame, text="0.10")
         self.ratio_label.grid(row=2, column=1, sticky=tk.E, pady=(5, 0))
-        self.ratio_var.trace_add('write', lambda *args: self.ratio_label.config(text=f"{self.ratio_var.get():.2f}"))
 
         # Initialize visibility
         self.toggle_riemersma_controls()
@@ -151,17 +231,21 @@ class ThermalPrintGUI:
         # Label type dropdown
         ttk.Label(controls_frame, text="Label Type:").grid(row=8, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
         self.label_var = tk.StringVar(value="4x6")
-        label_options = [f"{code} - {spec['name']}" for code, spec in LABEL_SPECS.items()]
+        # Parse the "code - name" display string once per change instead of
+        # on every access (previews, label info, printing all need the code).
+        self._current_label_code = "4x6"
+        self.label_var.trace_add('write', lambda *args: setattr(
+            self, '_current_label_code', self.label_var.get().split(' - ')[0]))
         self.label_combo = ttk.Combobox(
-            controls_frame, 
-            textvariable=self.label_var, 
-            values=label_options,
+            controls_frame,
+            textvariable=self.label_var,
+            values=_ALL_LABELS,
             state='readonly',
             width=25
         )
         self.label_combo.grid(row=9, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
         self.label_combo.current(0)
-        self.label_combo.bind('<<ComboboxSelected>>', lambda e: self.update_label_info())
+        self.label_combo.bind('<<ComboboxSelected>>', lambda e: self.on_label_change())
         
         # Refresh preview button
         self.refresh_btn = ttk.Button(
@@ -228,25 +312,84 @@ class ThermalPrintGUI:
         # Canvas for image preview
         self.canvas = tk.Canvas(preview_frame, bg='white', highlightthickness=1, highlightbackground='gray')
         self.canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Track the canvas size from <Configure> events rather than asking
+        # winfo_width/height (a Tcl round-trip) on every preview.
+        self._canvas_w = 600
+        self._canvas_h = 500
+        self.canvas.bind('<Configure>', self._on_canvas_resize)
         
         # Status label
         self.status_label = ttk.Label(preview_frame, text="Open an image to begin", anchor=tk.CENTER)
         self.status_label.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
     
+    def _restore_settings(self):
+        """Apply saved settings to the freshly built widgets"""
+        s = self._settings
+        if not s:
+            return
+        try:
+            self.brightness_var.set(float(s.get('brightness', 1.2)))
+            self.contrast_var.set(float(s.get('contrast', 1.0)))
+            self.history_depth_var.set(int(s.get('riemersma_history', 16)))
+            self.ratio_var.set(float(s.get('riemersma_ratio', 0.1)))
+            if s.get('dither') in self.dither_combo['values']:
+                self.dither_var.set(s['dither'])
+            if s.get('label') in _ALL_LABELS:
+                self.label_combo.set(s['label'])
+            self.lp_options_var.set(s.get('lp_options', ''))
+        except (TypeError, ValueError):
+            # A hand-edited or stale file shouldn't break startup
+            return
+        self.brightness_label.config(text=f"{self.brightness_var.get():.2f}")
+        self.contrast_label.config(text=f"{self.contrast_var.get():.2f}")
+        self.history_depth_label.config(text=str(self.history_depth_var.get()))
+        self.ratio_label.config(text=f"{self.ratio_var.get():.2f}")
+        self.toggle_riemersma_controls()
+        self.update_label_info()
+
+    def _save_settings(self):
+        """Write the current settings for the next launch"""
+        settings = {
+            'brightness': self.brightness_var.get(),
+            'contrast': self.contrast_var.get(),
+            'dither': self.dither_var.get(),
+            'riemersma_history': self.history_depth_var.get(),
+            'riemersma_ratio': self.ratio_var.get(),
+            'label': self.label_var.get(),
+            'lp_options': self.lp_options_var.get(),
+            'printer': self.printer_var.get(),
+        }
+        try:
+            _SETTINGS_PATH.write_text(json.dumps(settings, indent=2))
+        except OSError:
+            pass
+
     def load_printers(self):
-        """Load available printers from system"""
-        printers = list_printers()
+        """Kick off printer enumeration without blocking startup"""
+        # lpstat can stall for hundreds of ms when a printer is offline;
+        # show a placeholder and let the window map immediately.
+        self.printer_combo['values'] = ["Loading..."]
+        self.printer_combo.current(0)
+
+        def worker():
+            printers = list_printers()
+            self.root.after(0, lambda: self._populate_printers(printers))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _populate_printers(self, printers):
+        """Fill the printer combo on the UI thread once lpstat returns"""
         if printers:
             self.printer_combo['values'] = printers
-            # Auto-select preferred printer if available
-            target_keywords = ["dymo", "rx106", "comer"]
-            preferred_printers = [p for p in printers if any(kw in p.lower() for kw in target_keywords)]
-            
-            if preferred_printers:
-                self.printer_combo.set(preferred_printers[0])
+            # Last session's printer beats the keyword autopick
+            saved = self._settings.get('printer')
+            preferred = saved if saved in printers else autopick_printer()
+
+            if preferred:
+                self.printer_combo.set(preferred)
             else:
                 self.printer_combo.current(0)
-            
+
             # Update label list for selected printer
             self.update_label_list()
         else:
@@ -257,20 +400,40 @@ class ThermalPrintGUI:
         """Open file dialog and load image"""
         file_path = filedialog.askopenfilename(
             title="Select Image",
-            filetypes=[
-                ("Image files", "*.jpg *.jpeg *.png *.gif *.bmp *.tiff"),
-                ("All files", "*.*")
-            ]
+            filetypes=_IMAGE_FILETYPES
         )
         
         if file_path:
             try:
+                # Release the previous photo's buffers so memory stays
+                # bounded by the largest image, not the sum of the session.
+                # The close happens on the worker thread between jobs,
+                # since a render may still be reading this image.
+                if self.original_image is not None:
+                    self._retired_sources.append(self.original_image)
+                    self.original_image = None
+                    self.processed_image = None
+                    self._processed_arr = None
+                    self._scaled_cache = None
+                    self._source_cache = None
+
                 self.current_image_path = file_path
                 self.original_image = Image.open(file_path)
-                
+                # For JPEGs, libjpeg can decode directly at 1/2, 1/4 or
+                # 1/8 scale via DCT scaling. Twice the largest label edge
+                # leaves the Lanczos fit plenty of headroom while cutting
+                # a 48 MP photo's decode time and footprint several-fold.
+                # draft() is a no-op for other formats.
+                self.original_image.draft('L', (_MAX_LABEL_W * 2,
+                                                _MAX_LABEL_H * 2))
+                # Force the full decode now; previews then re-run only
+                # the pixel ops, not the JPEG/PNG decode.
+                self.original_image.load()
+                # New source invalidates the unchanged-params shortcut
+                self._last_params = None
+
                 # Update UI
-                import os
-                self.file_label.config(text=os.path.basename(file_path))
+                self.file_label.config(text=Path(file_path).name)
                 self.print_btn.config(state=tk.NORMAL)
                 self.save_btn.config(state=tk.NORMAL)
                 self.refresh_btn.config(state=tk.NORMAL)
@@ -281,9 +444,8 @@ class ThermalPrintGUI:
                 messagebox.showerror("Error", f"Failed to open image:\n{str(e)}")
     
     def get_label_code(self):
-        """Extract label code from combo box selection"""
-        selection = self.label_var.get()
-        return selection.split(' - ')[0]
+        """Label code for the current combo box selection"""
+        return self._current_label_code
 
     def update_label_list(self, event=None):
         """Update label combo box based on selected printer"""
@@ -292,13 +454,9 @@ class ThermalPrintGUI:
         # Determine brand filter
         brand_filter = 'dymo' if 'dymo' in printer else 'generic'
         
-        # Filter labels
-        filtered_labels = [
-            f"{code} - {spec['name']}" 
-            for code, spec in LABEL_SPECS.items() 
-            if spec.get('brand') == brand_filter
-        ]
-        
+        # Pick the precomputed tuple for the brand
+        filtered_labels = _DYMO_LABELS if brand_filter == 'dymo' else _GENERIC_LABELS
+
         # Update combo values
         self.label_combo['values'] = filtered_labels
         
@@ -333,18 +491,84 @@ class ThermalPrintGUI:
     def update_label_info(self):
         """Update label information display"""
         label_code = self.get_label_code()
-        if label_code in LABEL_SPECS:
-            spec = LABEL_SPECS[label_code]
+        spec = LABEL_SPECS.get(label_code)
+        if spec is not None:
             info_text = f"Code: {label_code}\n"
-            info_text += f"Size: {spec['name']}\n"
-            info_text += f"Pixels: {spec['width_px']} × {spec['height_px']}"
+            info_text += f"Size: {spec.name}\n"
+            info_text += f"Pixels: {spec.width_px} × {spec.height_px}"
             self.info_label.config(text=info_text)
     
+    def _queue_readout(self, label, text):
+        """Record a readout update and flush the batch at idle time"""
+        # Rapid drag ticks overwrite each other here; each label gets at
+        # most one config() (and one geometry pass) per event-loop idle.
+        self._pending_readouts[label] = text
+        if not self._readout_flush_scheduled:
+            self._readout_flush_scheduled = True
+            self.root.after_idle(self._flush_readouts)
+
+    def _flush_readouts(self):
+        """Apply the latest pending text to each dirty readout label"""
+        self._readout_flush_scheduled = False
+        pending, self._pending_readouts = self._pending_readouts, {}
+        for label, text in pending.items():
+            label.config(text=text)
+
+    def _on_brightness_move(self, value):
+        """Scale command: update the readout and debounce a preview"""
+        # The Scale passes the value straight in, so no trace callback or
+        # extra DoubleVar.get() round-trip per drag tick.
+        self._queue_readout(self.brightness_label, f"{float(value):.2f}")
+        self._schedule_preview()
+
+    def _on_contrast_move(self, value):
+        """Scale command: update the readout and debounce a preview"""
+        self._queue_readout(self.contrast_label, f"{float(value):.2f}")
+        self._schedule_preview()
+
+    def _on_history_depth_move(self, value):
+        """Scale command: update the readout and debounce a preview"""
+        self._queue_readout(self.history_depth_label, str(int(float(value))))
+        self._schedule_preview()
+
+    def _on_ratio_move(self, value):
+        """Scale command: update the readout and debounce a preview"""
+        self._queue_readout(self.ratio_label, f"{float(value):.2f}")
+        self._schedule_preview()
+
     def on_dither_change(self):
         """Called when dithering method changes (still auto-preview)"""
         self.toggle_riemersma_controls()
-        if self.current_image_path:
-            self.update_preview()
+        self._schedule_preview()
+
+    def on_label_change(self):
+        """Called when the label type changes"""
+        self.update_label_info()
+        self._schedule_preview()
+
+    def _schedule_preview(self):
+        """
+        Coalesce rapid control changes into a single render: re-arm a
+        short timer on every change so only the final value triggers
+        update_preview, instead of one full pipeline run per slider tick.
+        Meanwhile the canvas tracks the drag with a cheap threshold
+        render; the selected dither runs once the user pauses.
+        """
+        if not self.current_image_path:
+            return
+        if self._preview_after_id:
+            self.root.after_cancel(self._preview_after_id)
+        params = self._snapshot_params()
+        if params['dither'] != 'none':
+            # Tagged so the result only paints the canvas: it must not
+            # become the saved/printed processed_image or evict real
+            # renders from the preview LRU.
+            self._submit_request(dict(params, dither='none', placeholder=True))
+        self._preview_after_id = self.root.after(150, self._run_scheduled_preview)
+
+    def _run_scheduled_preview(self):
+        self._preview_after_id = None
+        self.update_preview()
 
     def toggle_riemersma_controls(self):
         """Show/hide Riemersma parameters based on selection"""
@@ -353,76 +577,185 @@ class ThermalPrintGUI:
         else:
             self.riemersma_frame.grid_remove()
     
+    def _snapshot_params(self):
+        """Snapshot the tk variables on the main thread; the worker only
+        sees plain values."""
+        label_code = self.get_label_code()
+        return {
+            # The source travels with the request so the worker never
+            # reads self.original_image mid-reopen.
+            'path': self.current_image_path,
+            'source': self.original_image,
+            'label_code': label_code,
+            # Resolve the spec here so the worker's hot path starts from
+            # the namedtuple directly instead of a LABEL_SPECS lookup.
+            'spec': LABEL_SPECS[label_code],
+            'brightness': self.brightness_var.get(),
+            'contrast': self.contrast_var.get(),
+            'dither': self.dither_var.get(),
+            'riemersma_history': self.history_depth_var.get(),
+            'riemersma_ratio': self.ratio_var.get(),
+        }
+
+    def _submit_request(self, params):
+        """Atomically replace any still-pending request with this one"""
+        try:
+            self._request_slot.get_nowait()
+        except queue.Empty:
+            pass
+        self._request_slot.put(params)
+
     def update_preview(self):
-        """Generate preview with current settings (threaded)"""
-        if self.preview_thread and self.preview_thread.is_alive():
-            # A preview is already being generated, skip
+        """Hand the current settings to the preview worker thread"""
+        if not self.original_image:
             return
-        
-        # Start preview generation in background thread
+
+        params = self._snapshot_params()
+        # The same settings render the same preview (e.g. flipping a
+        # combobox back and forth); don't even wake the worker.
+        if params == self._last_params and self.processed_image is not None:
+            return
+        self._last_params = params
+
         self.status_label.config(text="Generating preview...")
-        self.preview_thread = threading.Thread(target=self._generate_preview, daemon=True)
-        self.preview_thread.start()
-    
-    def _generate_preview(self):
-        """Background thread function to generate preview"""
+        self._submit_request(params)
+
+    def _preview_worker_loop(self):
+        """Long-lived worker: render whatever request is newest"""
+        while True:
+            params = self._request_slot.get()
+            # Between jobs is the only point where no render can be
+            # touching a replaced source, so retired images close here.
+            # A stale request can still reference a just-retired image;
+            # that one is kept until the following job.
+            keep = []
+            while self._retired_sources:
+                img = self._retired_sources.pop()
+                if img is params.get('source'):
+                    keep.append(img)
+                else:
+                    img.close()
+            self._retired_sources.extend(keep)
+            self._generate_preview(params)
+
+    def _generate_preview(self, params):
+        """Worker-side render of one preview request"""
         try:
-            label_code = self.get_label_code()
-            spec = LABEL_SPECS[label_code]
-            brightness = self.brightness_var.get()
-            contrast = self.contrast_var.get()
-            dither = self.dither_var.get()
-            riemersma_history = self.history_depth_var.get()
-            riemersma_ratio = self.ratio_var.get()
-            
-            # Generate processed image
+            spec = params['spec']
+            brightness = params['brightness']
+            contrast = params['contrast']
+            dither = params['dither']
+            riemersma_history = params['riemersma_history']
+            riemersma_ratio = params['riemersma_ratio']
+
+            # The mtime in the key retires entries if the file changes on
+            # disk between previews of the same path.
+            cache_key = (params['path'],
+                         Path(params['path']).stat().st_mtime,
+                         params['label_code'], brightness, contrast, dither,
+                         riemersma_history, riemersma_ratio)
+            placeholder = params.get('placeholder', False)
+            result_type = 'placeholder' if placeholder else 'success'
+
+            cached = self._preview_cache.get(cache_key)
+            if cached is not None:
+                if not placeholder:
+                    self._preview_cache.move_to_end(cache_key)
+                self.preview_queue.put((result_type, cached))
+                self.root.event_generate('<<PreviewReady>>', when='tail')
+                return
+
+            # Downscale toward label resolution before the pipeline runs:
+            # dither cost scales with pixel count, and anything beyond the
+            # label's own dimensions is resized away anyway. BILINEAR is
+            # fine here since the pipeline's Lanczos pass still does the
+            # final fit.
+            source = params['source']
+            max_dim = max(spec.width_px, spec.height_px)
+            if max(source.size) > max_dim:
+                source_key = cache_key[:2] + (max_dim,)
+                cached_source = self._source_cache
+                if cached_source and cached_source[0] == source_key:
+                    source = cached_source[1]
+                else:
+                    source = source.copy()
+                    source.thumbnail((max_dim, max_dim),
+                                     Image.Resampling.BILINEAR)
+                    self._source_cache = (source_key, source)
+
+            # Generate processed image from the already-decoded original,
+            # so each preview skips the file read and image decode.
             processed = prepare_image(
-                self.current_image_path,
+                source,
                 spec,
                 brightness=brightness,
                 contrast=contrast,
                 dither_alg=dither,
                 riemersma_history=riemersma_history,
-                riemersma_ratio=riemersma_ratio
+                riemersma_ratio=riemersma_ratio,
+                # 'L' avoids mode-'1' bit-unpacking in the NEAREST upscale
+                # and inside ImageTk.PhotoImage; printing still gets '1'.
+                return_mode='L'
             )
-            
+
+            if not placeholder:
+                self._preview_cache[cache_key] = processed
+                if len(self._preview_cache) > self._preview_cache_size:
+                    self._preview_cache.popitem(last=False)
+
             # Put result in queue for main thread to display
-            self.preview_queue.put(('success', processed))
-            
+            self.preview_queue.put((result_type, processed))
+
         except Exception as e:
             self.preview_queue.put(('error', str(e)))
-    
-    def process_preview_queue(self):
-        """Process preview generation results (runs in main thread)"""
+        # Wake the mainloop; event_generate is thread-safe in Tk 8.6+
+        self.root.event_generate('<<PreviewReady>>', when='tail')
+
+    def _on_preview_ready(self, event=None):
+        """Display finished preview results (runs in main thread)"""
         try:
             while True:
                 result_type, result_data = self.preview_queue.get_nowait()
-                
-                if result_type == 'success':
+
+                if result_type == 'placeholder':
+                    # Drag-time threshold render: paint it, but keep the
+                    # last real dither as the image Save/Print would use.
+                    self.display_preview(result_data)
+                elif result_type == 'success':
                     self.processed_image = result_data
+                    # Unpack to numpy once on arrival; every later
+                    # redisplay (e.g. the upscale after a window resize)
+                    # reuses this instead of re-converting the PIL image.
+                    self._processed_arr = np.asarray(result_data.convert('L')
+                                                     if result_data.mode == '1'
+                                                     else result_data)
                     self.display_preview(result_data)
                 elif result_type == 'error':
+                    # Forget the memoized params so Refresh can retry them
+                    self._last_params = None
                     self.status_label.config(text=f"Error: {result_data}")
-                    
+
         except queue.Empty:
             pass
-        
-        # Schedule next check
-        self.root.after(100, self.process_preview_queue)
     
+    def _on_canvas_resize(self, event):
+        """Cache canvas geometry and re-center the preview"""
+        self._canvas_w = event.width
+        self._canvas_h = event.height
+        if self._canvas_item is not None:
+            self.canvas.coords(self._canvas_item, event.width // 2, event.height // 2)
+
     def display_preview(self, processed_image):
         """Display processed image in canvas"""
         try:
-            # Get canvas dimensions
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            
-            # If canvas not yet sized, use default
-            if canvas_width <= 1:
-                canvas_width = 600
-            if canvas_height <= 1:
-                canvas_height = 500
-            
+            # Cache hits can redeliver the image already on screen; the
+            # pixels haven't changed, so skip the PhotoImage work.
+            if processed_image is self._displayed_image:
+                return
+
+            canvas_width = self._canvas_w
+            canvas_height = self._canvas_h
+
             # For dithered images, we want to preserve the crisp 1-bit quality
             # Calculate scale to fit in canvas, but prefer integer multiples
             img_width, img_height = processed_image.size
@@ -440,24 +773,48 @@ class ThermalPrintGUI:
                 # This preserves the dithering quality better than downscaling
                 scale = 1
             
-            # Scale up using NEAREST neighbor to keep sharp pixels
+            # Scale up using NEAREST neighbor to keep sharp pixels. The
+            # enlarged copy is cached against (source, scale): a canvas
+            # redraw of an unchanged preview (e.g. a window resize) then
+            # skips reallocating the multi-megabyte upscale buffer.
             if scale > 1:
-                new_width = img_width * scale
-                new_height = img_height * scale
-                display_image = processed_image.resize((new_width, new_height), Image.Resampling.NEAREST)
+                cached = self._scaled_cache
+                if cached and cached[0] is processed_image and cached[1] == scale:
+                    display_image = cached[2]
+                else:
+                    # Integer NEAREST upscale is pure pixel replication;
+                    # two np.repeat passes beat PIL's generic resampler.
+                    if (processed_image is self.processed_image
+                            and self._processed_arr is not None):
+                        arr = self._processed_arr
+                    else:
+                        arr = np.asarray(processed_image.convert('L')
+                                         if processed_image.mode == '1'
+                                         else processed_image)
+                    big = np.repeat(np.repeat(arr, scale, axis=0), scale, axis=1)
+                    display_image = Image.fromarray(big)
+                    self._scaled_cache = (processed_image, scale, display_image)
             else:
                 display_image = processed_image
             
-            # Convert to PhotoImage
-            self.preview_image = ImageTk.PhotoImage(display_image)
-            
-            # Clear canvas and display
-            self.canvas.delete("all")
-            
             # Center image
             x = canvas_width // 2
             y = canvas_height // 2
-            self.canvas.create_image(x, y, image=self.preview_image, anchor=tk.CENTER)
+
+            # Reuse one PhotoImage and one canvas item across updates:
+            # pasting into the existing buffer avoids allocating (and
+            # having Tk free) a full RGBA image per slider tick.
+            if (self.preview_image is not None and self._canvas_item is not None
+                    and display_image.size == (self.preview_image.width(),
+                                               self.preview_image.height())):
+                self.preview_image.paste(display_image)
+                self.canvas.coords(self._canvas_item, x, y)
+            else:
+                self.preview_image = ImageTk.PhotoImage(display_image)
+                self.canvas.delete("all")
+                self._canvas_item = self.canvas.create_image(
+                    x, y, image=self.preview_image, anchor=tk.CENTER)
+            self._displayed_image = processed_image
             
             # Update status with scale info
             if scale > 1:
@@ -475,7 +832,7 @@ class ThermalPrintGUI:
             return
         
         printer = self.printer_var.get()
-        if not printer or printer == "No printers found":
+        if not printer or printer in ("No printers found", "Loading..."):
             messagebox.showwarning("No Printer", "Please select a valid printer")
             return
         
@@ -491,10 +848,15 @@ class ThermalPrintGUI:
             self.print_btn.config(state=tk.DISABLED, text="Printing...")
             self.status_label.config(text="Sending to printer...")
             
-            # Print in background thread to keep UI responsive
+            # A short-lived thread renders the label and hands lp its
+            # data, then exits; nobody blocks in wait() for the job.
+            # Completion is detected by polling the Popen handle from
+            # the Tk event loop.
+            custom_options = self.lp_options_var.get()
+
             def print_thread():
                 try:
-                    print_raw(
+                    cmd, payload = build_print_job(
                         self.current_image_path,
                         printer,
                         label_code=label_code,
@@ -503,18 +865,40 @@ class ThermalPrintGUI:
                         dither_alg=dither,
                         riemersma_history=riemersma_history,
                         riemersma_ratio=riemersma_ratio,
-                        custom_options=self.lp_options_var.get()
+                        custom_options=custom_options
                     )
-                    self.root.after(0, lambda: self.print_complete(None))
+                    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+                    # The payload can exceed the pipe buffer, so the
+                    # write stays off the UI thread.
+                    try:
+                        proc.stdin.write(payload)
+                        proc.stdin.close()
+                    except BrokenPipeError:
+                        # lp exited before draining stdin (e.g. it
+                        # rejected the job); the poll below reports
+                        # its exit status.
+                        pass
+                    self.root.after(200, lambda: self._poll_print_job(proc))
                 except Exception as e:
-                    self.root.after(0, lambda: self.print_complete(str(e)))
-            
+                    # Bind now: the except block's name is gone by the
+                    # time the callback runs on the UI thread.
+                    msg = str(e)
+                    self.root.after(0, lambda: self.print_complete(msg))
+
             threading.Thread(target=print_thread, daemon=True).start()
             
         except Exception as e:
             messagebox.showerror("Print Error", f"Failed to print:\n{str(e)}")
             self.print_btn.config(state=tk.NORMAL, text="Print Image")
     
+    def _poll_print_job(self, proc):
+        """Check the lp process from the event loop until it exits"""
+        rc = proc.poll()
+        if rc is None:
+            self.root.after(200, lambda: self._poll_print_job(proc))
+        else:
+            self.print_complete(None if rc == 0 else f"lp exited with status {rc}")
+
     def print_complete(self, error):
         """Called when print job completes"""
         self.print_btn.config(state=tk.NORMAL, text="Print Image")
@@ -532,10 +916,8 @@ class ThermalPrintGUI:
             messagebox.showwarning("No Image", "Please open an image first")
             return
             
-        import os
         # Pre-populate with original filename but .png extension
-        base_name = os.path.splitext(os.path.basename(self.current_image_path))[0]
-        initial_file = f"{base_name}.png"
+        initial_file = f"{Path(self.current_image_path).stem}.png"
         
         file_path = filedialog.asksaveasfilename(
             title="Save Dithered Image",
@@ -547,11 +929,25 @@ class ThermalPrintGUI:
         if file_path:
             try:
                 self.processed_image.save(file_path)
-                self.status_label.config(text=f"Image saved to {os.path.basename(file_path)}")
+                self.status_label.config(text=f"Image saved to {Path(file_path).name}")
             except Exception as e:
                 messagebox.showerror("Save Error", f"Failed to save image:\n{str(e)}")
 
 
+    def _on_close(self):
+        """Persist settings, release image buffers and tear down"""
+        self._save_settings()
+        if self.original_image is not None:
+            self.original_image.close()
+        self.original_image = None
+        self.processed_image = None
+        self._processed_arr = None
+        self.preview_image = None
+        self._scaled_cache = None
+        self._source_cache = None
+        self.root.destroy()
+
+
 def main():
     root = tk.Tk()
     app = ThermalPrintGUI(root)